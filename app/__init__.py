@@ -15,10 +15,7 @@ sys.path.insert(0, current_dir)
 
 # Now we can import app modules
 try:
-    from app.utils.config import DATA_PATH, FAISS_INDEX_PATH, BM25_DATA_PATH
     from app.services.data_loader import RNEDataLoader
-    from app.services.faiss_retriever import FAISSRetriever
-    from app.services.bm25_retriever import BM25Retriever
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure you're running this from the project root directory")
@@ -103,6 +100,9 @@ def verify_json_file(file_path):
 
 def initialize_indices():
     """Initialize FAISS and BM25 indices."""
+    # Imported here so that importing the app package does not load the settings
+    from app.utils.config import DATA_PATH, FAISS_INDEX_PATH, BM25_DATA_PATH
+    
     logger.info("Initializing indices for the RNE chatbot...")
     
     # Verify project structure first
@@ -147,6 +147,10 @@ def initialize_indices():
             logger.error("No text extracted for indexing")
             return False
         
+        # Import the retrievers only when building (they pull in faiss, torch and rank_bm25)
+        from app.services.faiss_retriever import FAISSRetriever
+        from app.services.bm25_retriever import BM25Retriever
+        
         # Initialize retrievers
         logger.info("Initializing FAISS retriever...")
         faiss_retriever = FAISSRetriever(FAISS_INDEX_PATH)
@@ -220,6 +224,8 @@ def initialize_indices():
 
 def ensure_directories_exist():
     """Ensure all necessary directories exist."""
+    from app.utils.config import DATA_PATH, FAISS_INDEX_PATH, BM25_DATA_PATH
+    
     directories = [
         os.path.dirname(DATA_PATH),
         os.path.dirname(FAISS_INDEX_PATH), 
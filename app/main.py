@@ -7,10 +7,10 @@ from app.services.Chat_servicer import ChatServicer
 from app.utils.config import DEBUG, HOST, PORT
 
 from app.services import (
-    RNEDataLoader, TextProcessor, FAISSRetriever, 
+    RNEDataLoader, get_text_processor, FAISSRetriever, 
     BM25Retriever, HybridRetriever, OpenAIClient
 )
-from app.utils import LanguageDetector
+from app.utils import default_detector
 from app.utils.config import DATA_PATH, FAISS_INDEX_PATH, BM25_DATA_PATH
 import logging
 
@@ -42,8 +42,8 @@ def initialize_components():
     logger.info("Initializing components...")
     
     # Initialize basic components
-    text_processor = TextProcessor()
-    language_detector = LanguageDetector()
+    text_processor = get_text_processor()
+    language_detector = default_detector
     data_loader = RNEDataLoader(DATA_PATH)
     
     # Initialize retrievers
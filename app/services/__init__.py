@@ -1,18 +1,12 @@
 """
 Services package for business logic.
+
+Public names are imported lazily on first access (PEP 562), so importing
+one submodule does not pull in the others (and their faiss, torch,
+rank_bm25 or openai dependencies).
 """
 
-from .openai_client import (
-    OpenAIClient, 
-    ResponseType, 
-    FollowUpResponse, 
-    DirectResponse
-)
-from .data_loader import RNEDataLoader
-from .text_processor import TextProcessor
-from .bm25_retriever import BM25Retriever
-from .faiss_retriever import FAISSRetriever
-from .hybrid_retriever import HybridRetriever
+import importlib
 
 __all__ = [
     'OpenAIClient',
@@ -21,7 +15,32 @@ __all__ = [
     'DirectResponse',
     'RNEDataLoader',
     'TextProcessor',
+    'get_text_processor',
     'BM25Retriever',
     'FAISSRetriever',
     'HybridRetriever'
-]
\ No newline at end of file
+]
+
+# Public name -> submodule that defines it
+_LAZY = {
+    'OpenAIClient': 'app.services.openai_client',
+    'ResponseType': 'app.services.openai_client',
+    'FollowUpResponse': 'app.services.openai_client',
+    'DirectResponse': 'app.services.openai_client',
+    'RNEDataLoader': 'app.services.data_loader',
+    'TextProcessor': 'app.services.text_processor',
+    'get_text_processor': 'app.services.text_processor',
+    'BM25Retriever': 'app.services.bm25_retriever',
+    'FAISSRetriever': 'app.services.faiss_retriever',
+    'HybridRetriever': 'app.services.hybrid_retriever'
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
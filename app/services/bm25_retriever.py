@@ -15,7 +15,7 @@ except ImportError:
     logging.warning("rank_bm25 not available. BM25 retrieval will not work.")
     BM25_AVAILABLE = False
 
-from app.services.text_processor import TextProcessor
+from app.services.text_processor import get_text_processor
 
 class BM25Retriever:
     """
@@ -39,7 +39,7 @@ class BM25Retriever:
         self.tokenized_corpus_ar = []  # Tokenized Arabic corpus
         self.documents_fr = []  # French documents
         self.documents_ar = []  # Arabic documents
-        self.text_processor = TextProcessor()
+        self.text_processor = get_text_processor()
         
     def build_index(self, texts: List[str], documents: List[Dict[str, Any]]) -> None:
         """
@@ -2,8 +2,8 @@
 Module for loading and preprocessing RNE laws data from multiple JSON files.
 """
 
-import json
 import os
+import orjson
 from typing import Dict, List, Any, Tuple
 import logging
 from pathlib import Path
@@ -81,8 +81,8 @@ class RNEDataLoader:
             filename = os.path.basename(file_path)
             
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    file_data = json.load(f)
+                with open(file_path, 'rb') as f:
+                    file_data = orjson.loads(f.read())
                     
                 # If the data is a single dictionary, convert it to a list
                 if isinstance(file_data, dict):
@@ -94,7 +94,7 @@ class RNEDataLoader:
                 description = self.expected_files.get(filename, "Unknown data type")
                 logging.info(f"Successfully loaded {len(file_data)} items from {filename} ({description})")
                 
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 error_message = f"Error parsing JSON file {filename}: {str(e)}"
                 logging.error(error_message)
                 # Continue loading other files instead of failing completely
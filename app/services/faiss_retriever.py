@@ -224,34 +224,97 @@ class FAISSRetriever:
             search_k = top_k * 3 if language else top_k
             scores, indices = self.index.search(query_embedding, min(search_k, self.index.ntotal))
             
-            # Extract results
-            results = []
-            for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-                if idx < 0 or idx >= len(self.documents):
-                    continue
-                    
-                document = self.documents[idx]
-                
-                # Filter by language if specified
-                if language and document.get('language') != language:
-                    continue
-                    
-                results.append({
-                    'document': document,
-                    'score': float(score),  # Convert from numpy float to Python float
-                    'rank': len(results) + 1
-                })
-                
-                # Stop once we have enough results after filtering
-                if len(results) >= top_k:
-                    break
-                    
-            return results
+            return self._collect_results(scores[0], indices[0], top_k, language)
             
         except Exception as e:
             logging.error(f"Error in FAISS search: {e}")
             return []
     
+    def search_batch(self, queries: List[str], top_k: int = 3, language: str = None) -> List[List[Dict[str, Any]]]:
+        """
+        Search the index for several queries at once.
+        
+        All queries are embedded in one encoder call and looked up with a single
+        batched index search.
+        
+        Args:
+            queries: List of query strings.
+            top_k: Number of top results to return per query.
+            language: Optional language filter ('fr' or 'ar').
+            
+        Returns:
+            One result list per query, in the same order as the queries.
+        """
+        results = [[] for _ in queries]
+        
+        if not self.index:
+            logging.warning("FAISS index not built or loaded")
+            return results
+            
+        # Empty queries keep an empty result list
+        valid = [i for i, query in enumerate(queries) if query and query.strip()]
+        if not valid:
+            return results
+            
+        try:
+            # Create all query embeddings in one batch
+            query_embeddings = self._create_embeddings([queries[i] for i in valid])
+            
+            if query_embeddings is None or len(query_embeddings) == 0:
+                logging.error("Failed to create query embeddings")
+                return results
+            
+            # Normalize for cosine similarity
+            faiss.normalize_L2(query_embeddings)
+            
+            # Search the index for all queries at once
+            search_k = top_k * 3 if language else top_k
+            scores, indices = self.index.search(query_embeddings, min(search_k, self.index.ntotal))
+            
+            for row, i in enumerate(valid):
+                results[i] = self._collect_results(scores[row], indices[row], top_k, language)
+            return results
+            
+        except Exception as e:
+            logging.error(f"Error in FAISS batch search: {e}")
+            return [[] for _ in queries]
+    
+    def _collect_results(self, scores: np.ndarray, indices: np.ndarray, top_k: int, language: str = None) -> List[Dict[str, Any]]:
+        """
+        Turn one row of FAISS search output into result dictionaries.
+        
+        Args:
+            scores: Similarity scores for one query.
+            indices: Document indices for one query.
+            top_k: Number of top results to return.
+            language: Optional language filter ('fr' or 'ar').
+            
+        Returns:
+            List of dictionaries with document info and scores.
+        """
+        results = []
+        for score, idx in zip(scores, indices):
+            if idx < 0 or idx >= len(self.documents):
+                continue
+                
+            document = self.documents[idx]
+            
+            # Filter by language if specified
+            if language and document.get('language') != language:
+                continue
+                
+            results.append({
+                'document': document,
+                'score': float(score),  # Convert from numpy float to Python float
+                'rank': len(results) + 1
+            })
+            
+            # Stop once we have enough results after filtering
+            if len(results) >= top_k:
+                break
+                
+        return results
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the FAISS index.
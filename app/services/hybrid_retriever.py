@@ -2,13 +2,14 @@
 Hybrid retrieval system combining FAISS and BM25.
 """
 
+import numpy as np
 from typing import List, Dict, Any
 import logging
 
 from app.utils.config import FAISS_WEIGHT, BM25_WEIGHT, TOP_K_RETRIEVAL
 from app.services.faiss_retriever import FAISSRetriever
 from app.services.bm25_retriever import BM25Retriever
-from app.services.text_processor import TextProcessor
+from app.services.text_processor import get_text_processor
 
 class HybridRetriever:
     """
@@ -35,12 +36,18 @@ class HybridRetriever:
         self.bm25_retriever = bm25_retriever
         self.faiss_weight = faiss_weight
         self.bm25_weight = bm25_weight
-        self.text_processor = TextProcessor()
+        self.text_processor = get_text_processor()
         
         # Validate that at least one retriever is available
         if not self.faiss_retriever and not self.bm25_retriever:
             raise ValueError("At least one retriever (FAISS or BM25) must be provided")
             
+        # With a single retriever there is nothing to fuse, so dispatch once here
+        if not self.bm25_retriever:
+            self.search = self._search_faiss_only
+        elif not self.faiss_retriever:
+            self.search = self._search_bm25_only
+            
         logging.info(f"Initialized HybridRetriever with FAISS weight: {faiss_weight}, BM25 weight: {bm25_weight}")
         
     def search(self, query: str, top_k: int = TOP_K_RETRIEVAL, language: str = None) -> List[Dict[str, Any]]:
@@ -100,37 +107,65 @@ class HybridRetriever:
             logging.error(f"Error in hybrid search: {e}")
             return []
     
+    def _search_faiss_only(self, query: str, top_k: int = TOP_K_RETRIEVAL, language: str = None) -> List[Dict[str, Any]]:
+        """Search when only the FAISS retriever is configured (same contract as search)."""
+        if not query or not query.strip():
+            return []
+            
+        try:
+            if not language:
+                language = self.text_processor.detect_language(query)
+            return self.faiss_retriever.search(query, top_k, language)[:top_k]
+        except Exception as e:
+            logging.error(f"Error in FAISS search: {e}")
+            return []
+    
+    def _search_bm25_only(self, query: str, top_k: int = TOP_K_RETRIEVAL, language: str = None) -> List[Dict[str, Any]]:
+        """Search when only the BM25 retriever is configured (same contract as search)."""
+        if not query or not query.strip():
+            return []
+            
+        try:
+            if not language:
+                language = self.text_processor.detect_language(query)
+            return self.bm25_retriever.search(query, top_k, language)[:top_k]
+        except Exception as e:
+            logging.error(f"Error in BM25 search: {e}")
+            return []
+    
     def _normalize_scores(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Normalize scores to be between 0 and 1.
         
+        The result dictionaries are updated in place, so callers must not
+        rely on the original scores afterwards.
+        
         Args:
             results: List of result dictionaries with scores.
             
         Returns:
-            List of result dictionaries with normalized scores.
+            The same list, with normalized scores.
         """
         if not results:
             return []
             
         try:
             # Extract scores
-            scores = [result['score'] for result in results]
+            scores = np.fromiter((result['score'] for result in results), dtype=np.float64, count=len(results))
             
             # Find min and max scores
-            min_score = min(scores)
-            max_score = max(scores)
-            
-            # Avoid division by zero
-            if max_score == min_score:
-                # If all scores are the same, set them to 1.0
-                for result in results:
-                    result['score'] = 1.0
-                return results
+            min_score = scores.min()
+            score_range = scores.max() - min_score
+            
+            # Avoid division by zero: if all scores are the same, set them to 1.0
+            if score_range == 0:
+                scores.fill(1.0)
+            else:
+                # Normalize scores to [0, 1]
+                scores = (scores - min_score) / score_range
                 
-            # Normalize scores to [0, 1]
-            for result in results:
-                result['score'] = (result['score'] - min_score) / (max_score - min_score)
+            for result, score in zip(results, scores):
+                result['score'] = float(score)
                 
             return results
             
@@ -157,54 +192,38 @@ class HybridRetriever:
         """
         try:
             # Normalize scores within each system
-            faiss_results = self._normalize_scores(faiss_results.copy())
-            bm25_results = self._normalize_scores(bm25_results.copy())
+            # Scores are normalized in place; search() does not reuse these lists
+            faiss_results = self._normalize_scores(faiss_results)
+            bm25_results = self._normalize_scores(bm25_results)
             
-            # Create a dictionary to store combined scores
-            doc_scores = {}
+            # Map doc_id -> [faiss_score, bm25_score, document]
+            entries = {}
             
             # Add FAISS scores
             for result in faiss_results:
-                doc_id = result['document']['id']
-                doc_scores[doc_id] = {
-                    'document': result['document'],
-                    'faiss_score': result['score'] * self.faiss_weight,
-                    'bm25_score': 0,
-                    'combined_score': 0
-                }
+                entry = entries.setdefault(result['document']['id'], [0.0, 0.0, result['document']])
+                entry[0] = result['score'] * self.faiss_weight
                 
             # Add BM25 scores
             for result in bm25_results:
-                doc_id = result['document']['id']
-                if doc_id in doc_scores:
-                    doc_scores[doc_id]['bm25_score'] = result['score'] * self.bm25_weight
-                else:
-                    doc_scores[doc_id] = {
-                        'document': result['document'],
-                        'faiss_score': 0,
-                        'bm25_score': result['score'] * self.bm25_weight,
-                        'combined_score': 0
-                    }
+                entry = entries.setdefault(result['document']['id'], [0.0, 0.0, result['document']])
+                entry[1] = result['score'] * self.bm25_weight
                     
-            # Calculate combined scores
-            for doc_id, data in doc_scores.items():
-                data['combined_score'] = data['faiss_score'] + data['bm25_score']
-                
             # Sort by combined score
-            sorted_results = sorted(
-                doc_scores.values(), 
-                key=lambda x: x['combined_score'], 
+            sorted_entries = sorted(
+                entries.values(), 
+                key=lambda entry: entry[0] + entry[1], 
                 reverse=True
             )
             
             # Format the final results
             final_results = []
-            for i, result in enumerate(sorted_results[:top_k]):
+            for i, (faiss_score, bm25_score, document) in enumerate(sorted_entries[:top_k]):
                 final_results.append({
-                    'document': result['document'],
-                    'score': result['combined_score'],
-                    'faiss_score': result['faiss_score'],
-                    'bm25_score': result['bm25_score'],
+                    'document': document,
+                    'score': faiss_score + bm25_score,
+                    'faiss_score': faiss_score,
+                    'bm25_score': bm25_score,
                     'rank': i + 1
                 })
                 
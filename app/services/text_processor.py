@@ -4,6 +4,7 @@ Text preprocessing utilities for the RNE chatbot.
 
 import re
 import logging
+from functools import lru_cache
 from typing import List, Optional
 
 # Try to import language detection and NLTK
@@ -35,6 +36,64 @@ except ImportError:
     logging.warning("NLTK not available. Will use basic stopword filtering.")
     NLTK_STOPWORDS_AVAILABLE = False
 
+# Compiled once: any Arabic codepoint is definitive for language detection
+_ARABIC_RE = re.compile(r'[\u0600-\u06FF]')
+
+# French accented letters, used as a cheap pre-check before langdetect
+_FR_ACCENT_RE = re.compile(r'[àâçéèêëîïôùûüÿœæ]', re.IGNORECASE)
+
+# Compiled once: word tokens for the tokenizer / preprocessing pipeline
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+# Short tokens (< 2 chars) that are still kept by the tokenizer
+_MEANINGFUL_SHORT_FR = frozenset({'à', 'au', 'du', 'de', 'le', 'la', 'un', 'et', 'ou', 'si', 'en', 'on'})
+_MEANINGFUL_SHORT_AR = _MEANINGFUL_SHORT_FR | {'في', 'من', 'إلى', 'على', 'عن', 'هو', 'هي', 'لا', 'ما'}
+
+_EMPTY_STOPWORDS = frozenset()
+
+def _normalize(text: str, language: str) -> str:
+    """Normalize text for an already-resolved language (see TextProcessor.normalize_text)."""
+    # Remove URLs
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    
+    # Remove email addresses
+    text = re.sub(r'\S+@\S+', '', text)
+    
+    # Remove special characters while preserving language-specific characters
+    if language == 'ar':
+        # Preserve Arabic unicode range, numbers, and basic punctuation
+        text = re.sub(r'[^\u0600-\u06FF\u0660-\u0669\s\d\.\,\!\?\:\;]', ' ', text)
+    else:
+        # For non-Arabic, remove special chars but keep alphanumeric, accented chars, and basic punctuation
+        text = re.sub(r'[^\w\s\u00C0-\u017F\.\,\!\?\:\;]', ' ', text)
+    
+    # Normalize whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    
+    # Convert to lowercase for non-Arabic text
+    if language != 'ar':
+        text = text.lower()
+    
+    return text
+
+@lru_cache(maxsize=4096)
+def _preprocess_cached(text: str, language: str, stops: frozenset) -> tuple:
+    """
+    Normalize, tokenize and filter stopwords in a single pass.
+    
+    Cached on (text, language, stops); returns a tuple so cached results
+    cannot be mutated by callers.
+    """
+    normalized_text = _normalize(text, language)
+    meaningful_short = _MEANINGFUL_SHORT_AR if language == 'ar' else _MEANINGFUL_SHORT_FR
+    
+    # _normalize already lowercased non-Arabic text, so no per-token lower()
+    tokens = (match.group(0) for match in _TOKEN_RE.finditer(normalized_text))
+    return tuple(
+        token for token in tokens
+        if (len(token) >= 2 or token in meaningful_short) and token not in stops
+    )
+
 class TextProcessor:
     """Class for text preprocessing operations."""
     
@@ -79,6 +138,10 @@ class TextProcessor:
             self.ar_stopwords = self.basic_ar_stopwords
             logging.info("Using basic stopwords")
         
+        # Stopwords are read-only after initialization
+        self.fr_stopwords = frozenset(self.fr_stopwords)
+        self.ar_stopwords = frozenset(self.ar_stopwords)
+        
     def detect_language(self, text: str) -> str:
         """
         Detect the language of the input text.
@@ -92,10 +155,12 @@ class TextProcessor:
         if not text or not text.strip():
             return 'fr'  # Default to French
             
-        if not LANGDETECT_AVAILABLE:
-            # Simple heuristic: if text contains Arabic characters, assume Arabic
-            if re.search(r'[\u0600-\u06FF]', text):
-                return 'ar'
+        # Any Arabic character is definitive, no need for the statistical detector
+        if _ARABIC_RE.search(text):
+            return 'ar'
+            
+        # Accented Latin letters are a strong enough French signal
+        if not LANGDETECT_AVAILABLE or _FR_ACCENT_RE.search(text):
             return 'fr'
             
         try:
@@ -107,9 +172,6 @@ class TextProcessor:
             return lang
         except Exception as e:
             logging.debug(f"Language detection failed: {e}. Defaulting to French.")
-            # Fallback heuristic
-            if re.search(r'[\u0600-\u06FF]', text):
-                return 'ar'
             return 'fr'
     
     def normalize_text(self, text: str, language: Optional[str] = None) -> str:
@@ -129,28 +191,7 @@ class TextProcessor:
         if not language:
             language = self.detect_language(text)
             
-        # Remove URLs
-        text = re.sub(r'https?://\S+|www\.\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove special characters while preserving language-specific characters
-        if language == 'ar':
-            # Preserve Arabic unicode range, numbers, and basic punctuation
-            text = re.sub(r'[^\u0600-\u06FF\u0660-\u0669\s\d\.\,\!\?\:\;]', ' ', text)
-        else:
-            # For non-Arabic, remove special chars but keep alphanumeric, accented chars, and basic punctuation
-            text = re.sub(r'[^\w\s\u00C0-\u017F\.\,\!\?\:\;]', ' ', text)
-            
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Convert to lowercase for non-Arabic text
-        if language != 'ar':
-            text = text.lower()
-        
-        return text
+        return _normalize(text, language)
     
     def tokenize(self, text: str, language: Optional[str] = None) -> List[str]:
         """
@@ -171,12 +212,10 @@ class TextProcessor:
             
         # Simple tokenization by whitespace and punctuation
         # Split on whitespace and common punctuation
-        tokens = re.findall(r'\b\w+\b', text)
+        tokens = _TOKEN_RE.findall(text)
         
         # Filter out very short tokens (less than 2 characters) except for meaningful short words
-        meaningful_short = {'à', 'au', 'du', 'de', 'le', 'la', 'un', 'et', 'ou', 'si', 'en', 'on'}
-        if language == 'ar':
-            meaningful_short.update({'في', 'من', 'إلى', 'على', 'عن', 'هو', 'هي', 'لا', 'ما'})
+        meaningful_short = _MEANINGFUL_SHORT_AR if language == 'ar' else _MEANINGFUL_SHORT_FR
         
         tokens = [token for token in tokens if len(token) >= 2 or token.lower() in meaningful_short]
         
@@ -186,8 +225,11 @@ class TextProcessor:
         """
         Remove stopwords from a list of tokens.
         
+        Tokens are expected to come from normalize_text, which already
+        lowercases non-Arabic text, so French tokens are not lowercased again.
+        
         Args:
-            tokens: List of tokens.
+            tokens: List of normalized tokens.
             language: Language of the tokens ('fr' or 'ar'). If None, will be detected.
             
         Returns:
@@ -201,7 +243,10 @@ class TextProcessor:
             language = self.detect_language(' '.join(tokens))
             
         if language == 'fr':
-            return [token for token in tokens if token.lower() not in self.fr_stopwords]
+            # Only pay for the invariant check when debug logging is on
+            if logging.getLogger().isEnabledFor(logging.DEBUG) and any(token != token.lower() for token in tokens):
+                logging.debug("remove_stopwords got French tokens that are not lowercased; matching them as-is")
+            return [token for token in tokens if token not in self.fr_stopwords]
         elif language == 'ar':
             return [token for token in tokens if token not in self.ar_stopwords]
         else:
@@ -227,14 +272,17 @@ class TextProcessor:
             language = self.detect_language(text)
             
         try:
-            normalized_text = self.normalize_text(text, language)
-            tokens = self.tokenize(normalized_text, language)
-            
-            if remove_stops:
-                filtered_tokens = self.remove_stopwords(tokens, language)
-                return filtered_tokens
+            if not remove_stops:
+                stops = _EMPTY_STOPWORDS
+            elif language == 'fr':
+                stops = self.fr_stopwords
+            elif language == 'ar':
+                stops = self.ar_stopwords
             else:
-                return tokens
+                # For other languages, don't remove stopwords
+                stops = _EMPTY_STOPWORDS
+            
+            return list(_preprocess_cached(text, language, stops))
                 
         except Exception as e:
             logging.error(f"Error in text preprocessing: {e}")
@@ -307,4 +355,14 @@ class TextProcessor:
                 seen.add(keyword.lower())
                 unique_keywords.append(keyword)
                 
-        return unique_keywords[:max_keywords]
\ No newline at end of file
+        return unique_keywords[:max_keywords]
+
+@lru_cache(maxsize=1)
+def get_text_processor() -> TextProcessor:
+    """
+    Get the process-wide shared TextProcessor.
+    
+    TextProcessor holds no per-call state, so retrievers share one instance
+    instead of each loading and building their own stopword sets.
+    """
+    return TextProcessor()
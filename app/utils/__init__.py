@@ -1,17 +1,11 @@
 """
 Utils package for helper functions and utilities.
+
+Public names are imported lazily on first access (PEP 562), so importing
+one submodule does not pull in the others.
 """
 
-from .prompt_templates import (
-    SYSTEM_PROMPT_FR,
-    SYSTEM_PROMPT_AR,
-    QUESTION_SEGMENTATION_PROMPT,
-    format_context,
-    get_no_results_response,
-    format_final_response
-)
-from .language_detector import LanguageDetector
-from .response_formatter import ResponseFormatter
+import importlib
 
 __all__ = [
     'SYSTEM_PROMPT_FR',
@@ -21,5 +15,31 @@ __all__ = [
     'get_no_results_response',
     'format_final_response',
     'LanguageDetector',
+    'default_detector',
+    'get_detector',
     'ResponseFormatter'
-]
\ No newline at end of file
+]
+
+# Public name -> submodule that defines it
+_LAZY = {
+    'SYSTEM_PROMPT_FR': 'app.utils.prompt_templates',
+    'SYSTEM_PROMPT_AR': 'app.utils.prompt_templates',
+    'QUESTION_SEGMENTATION_PROMPT': 'app.utils.prompt_templates',
+    'format_context': 'app.utils.prompt_templates',
+    'get_no_results_response': 'app.utils.prompt_templates',
+    'format_final_response': 'app.utils.prompt_templates',
+    'LanguageDetector': 'app.utils.language_detector',
+    'default_detector': 'app.utils.language_detector',
+    'get_detector': 'app.utils.language_detector',
+    'ResponseFormatter': 'app.utils.response_formatter'
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
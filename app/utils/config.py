@@ -3,12 +3,10 @@ Configuration settings for the RNE Chatbot application.
 """
 
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from functools import lru_cache
+from dotenv import load_dotenv, dotenv_values
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict
+from pydantic import ConfigDict, field_validator
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -16,16 +14,98 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding='utf-8',
         case_sensitive=False,
-        extra='allow'  # This allows extra fields from .env
+        extra='ignore'  # Only declared fields are parsed; other .env keys are skipped
     )
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    # OpenAI API settings
+    openai_api_key: str = ""
+    llm_model: str = "gpt-3.5-turbo"
+
+    # Retrieval settings
+    faiss_weight: float = 0.5
+    bm25_weight: float = 0.5
+    top_k_retrieval: int = 3
+
+    # Vector embedding settings
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_dimension: int = 384
+
+    # Flask settings
+    debug: bool = False
+    host: str = "0.0.0.0"
+    port: int = 5001
+
+    # Data paths (unset paths are derived from data_dir)
+    data_dir: str = "data"
+    data_path: Optional[str] = None
+    faiss_index_path: Optional[str] = None
+    bm25_data_path: Optional[str] = None
+
+    # Prompt settings
+    max_context_length: int = 4096
+    system_prompt: str = """You are an expert legal assistant specializing in Tunisian RNE laws."""
+
+    @field_validator('debug', mode='before')
+    @classmethod
+    def parse_debug(cls, value):
+        """Only "true", "1" and "t" (any case) enable debug; anything else is False."""
+        if isinstance(value, bool):
+            return value
+        return str(value).lower() in ("true", "1", "t")
+
+def _find_env_file(filename: str = ".env") -> Optional[str]:
+    """
+    Find the .env file by walking up from this module's directory.
+    
+    Mirrors load_dotenv()'s find_dotenv() lookup, but uses os.path.exists so
+    non-regular files (FIFOs, secret-manager streams) are found too.
+    
+    Returns:
+        Path of the first .env file found, or None.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, filename)
+        if os.path.exists(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
 
-# OpenAI API settings
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
-DATA_DIR = os.path.join(BASE_DIR, "data")
-DATA_PATH = DATA_DIR  # The data loader will scan this directory for JSON files
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings.
+
+    The .env file is loaded and parsed only once per process; later calls
+    return the cached Settings instance.
+
+    Returns:
+        Cached Settings instance.
+    """
+    # Load environment variables from .env file
+    env_path = os.getenv("DOTENV_PATH") or _find_env_file()
+    if env_path and os.path.isfile(env_path):
+        load_dotenv(env_path)
+    elif env_path and os.path.exists(env_path):
+        # Not a regular file (FIFO, secret-manager stream): read it exactly once
+        with open(env_path, 'r', encoding='utf-8') as f:
+            for key, value in dotenv_values(stream=f).items():
+                # Like load_dotenv, never override variables that are already set
+                if value is not None:
+                    os.environ.setdefault(key, value)
+            
+    # The environment is populated now, so don't let pydantic re-read the file
+    settings = Settings(_env_file=None)
+    
+    # Validate API key
+    if not settings.openai_api_key:
+        print("Warning: OPENAI_API_KEY not found in environment variables")
+        
+    return settings
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Expected data files (for reference and validation)
 EXPECTED_DATA_FILES = {
@@ -33,34 +113,53 @@ EXPECTED_DATA_FILES = {
     "rne_laws.json": "RNE legal procedures", 
     "fiscal_knowledge.json": "Additional fiscal information"
 }
-# Validate API key
-if not OPENAI_API_KEY:
-    print("Warning: OPENAI_API_KEY not found in environment variables")
-
-# Retrieval settings
-FAISS_WEIGHT = float(os.getenv("FAISS_WEIGHT", "0.5"))
-BM25_WEIGHT = float(os.getenv("BM25_WEIGHT", "0.5"))
-TOP_K_RETRIEVAL = int(os.getenv("TOP_K_RETRIEVAL", "3"))
-
-# Vector embedding settings
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "384"))
 
 # Language settings
 SUPPORTED_LANGUAGES = ["fr", "ar"]
 DEFAULT_LANGUAGE = "fr"
 
-# Flask settings
-DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
-HOST = os.getenv("HOST", "0.0.0.0")
-PORT = int(os.getenv("PORT", "5001"))
-
-# Data paths
-DATA_DIR = os.getenv("DATA_DIR", "data")
-DATA_PATH = os.getenv("DATA_PATH", os.path.join(DATA_DIR, "rne_laws.json"))
-FAISS_INDEX_PATH = os.getenv("FAISS_INDEX_PATH", os.path.join(DATA_DIR, "faiss_index.bin"))
-BM25_DATA_PATH = os.getenv("BM25_DATA_PATH", os.path.join(DATA_DIR, "bm25_data.pkl"))
+# Environment-backed settings, resolved on first access (see __getattr__)
+_LAZY_SETTINGS = {
+    "settings": lambda s: s,
+    
+    # OpenAI API settings
+    "OPENAI_API_KEY": lambda s: s.openai_api_key,
+    "LLM_MODEL": lambda s: s.llm_model,
+    
+    # Retrieval settings
+    "FAISS_WEIGHT": lambda s: s.faiss_weight,
+    "BM25_WEIGHT": lambda s: s.bm25_weight,
+    "TOP_K_RETRIEVAL": lambda s: s.top_k_retrieval,
+    
+    # Vector embedding settings
+    "EMBEDDING_MODEL": lambda s: s.embedding_model,
+    "EMBEDDING_DIMENSION": lambda s: s.embedding_dimension,
+    
+    # Flask settings
+    "DEBUG": lambda s: s.debug,
+    "HOST": lambda s: s.host,
+    "PORT": lambda s: s.port,
+    
+    # Data paths
+    "DATA_DIR": lambda s: s.data_dir,
+    "DATA_PATH": lambda s: s.data_path or os.path.join(s.data_dir, "rne_laws.json"),
+    "FAISS_INDEX_PATH": lambda s: s.faiss_index_path or os.path.join(s.data_dir, "faiss_index.bin"),
+    "BM25_DATA_PATH": lambda s: s.bm25_data_path or os.path.join(s.data_dir, "bm25_data.pkl"),
+    
+    # Prompt settings
+    "MAX_CONTEXT_LENGTH": lambda s: s.max_context_length,
+    "SYSTEM_PROMPT": lambda s: s.system_prompt,
+}
 
-# Prompt settings
-MAX_CONTEXT_LENGTH = int(os.getenv("MAX_CONTEXT_LENGTH", "4096"))
-SYSTEM_PROMPT = os.getenv("SYSTEM_PROMPT", """You are an expert legal assistant specializing in Tunisian RNE laws.""")
+def __getattr__(name):
+    """
+    Resolve environment-backed settings lazily (PEP 562).
+    
+    The .env file and environment are only read when a setting is first
+    accessed; the value is then cached as a regular module attribute.
+    """
+    if name in _LAZY_SETTINGS:
+        value = _LAZY_SETTINGS[name](get_settings())
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,18 +4,105 @@ Language detection utilities for the RNE chatbot.
 
 import re
 import logging
+from functools import lru_cache
 from typing import List, Optional
 
+# Prefer CLD3 (compiled C++ model, single call per text) over langdetect
+try:
+    import cld3
+    CLD3_AVAILABLE = True
+except ImportError:
+    CLD3_AVAILABLE = False
+
 try:
     from langdetect import detect, LangDetectException
     LANGDETECT_AVAILABLE = True
 except ImportError:
-    logging.warning("langdetect not available. Using regex-based language detection.")
+    if not CLD3_AVAILABLE:
+        logging.warning("Neither cld3 nor langdetect available. Using regex-based language detection.")
     LANGDETECT_AVAILABLE = False
 
+STATISTICAL_DETECTION_AVAILABLE = CLD3_AVAILABLE or LANGDETECT_AVAILABLE
+
+def _statistical_detect(text: str) -> str:
+    """
+    Detect language with the fastest available statistical model.
+    
+    Args:
+        text: Input text.
+        
+    Returns:
+        ISO language code.
+        
+    Raises:
+        ValueError: If CLD3 has no reliable prediction for the text.
+    """
+    if CLD3_AVAILABLE:
+        prediction = cld3.get_language(text)
+        if prediction is None or not prediction.is_reliable:
+            raise ValueError("No reliable CLD3 prediction")
+        return prediction.language
+    return detect(text)
+
+# Word tokenizer for keyword matching
+_WORD_RE = re.compile(r'\w+')
+
+# Inputs longer than this are scanned for accents with a regex instead of a set test
+_LONG_TEXT_THRESHOLD = 512
+
+# Statistical detectors are unreliable below this length; use patterns instead
+_MIN_STATISTICAL_LENGTH = 20
+
+# French accented letters; a set-membership scan beats regex startup on short texts
+_FR_ACCENTS = frozenset('àâäéèêëïîôöùûüÿç')
+
+# Right-to-left languages
+_RTL_LANGUAGES = frozenset({'ar', 'he', 'fa', 'ur'})
+
+# Full names of known languages
+_LANGUAGE_NAMES = {
+    'fr': 'Français',
+    'ar': 'العربية',
+    'en': 'English',
+    'es': 'Español',
+    'de': 'Deutsch'
+}
+
+# Common variations of language names mapped to language codes
+_LANGUAGE_MAPPINGS = {
+    'french': 'fr',
+    'francais': 'fr',
+    'français': 'fr',
+    'arabic': 'ar',
+    'arabe': 'ar',
+    'العربية': 'ar'
+}
+
+@lru_cache(maxsize=64)
+def _language_name(language_code: str) -> str:
+    """Full language name for a code (see LanguageDetector.get_language_name)."""
+    return _LANGUAGE_NAMES.get(language_code, language_code.upper())
+
 class LanguageDetector:
     """Class for language detection and related utilities."""
     
+    # Regular expressions for language detection backup, compiled once per process
+    arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]+')
+    french_keywords = frozenset({
+        'quel', 'quelle', 'quels', 'quelles', 'comment', 'pourquoi', 'quand', 'où',
+        'combien', 'est', 'sont', 'être', 'avoir', 'faire', 'aller', 'venir',
+        'société', 'entreprise', 'création', 'capital', 'délai', 'document'
+    })
+    
+    arabic_keywords = frozenset({
+        'ما', 'ماذا', 'كيف', 'لماذا', 'متى', 'أين', 'كم', 'هل',
+        'شركة', 'مؤسسة', 'تأسيس', 'رأس المال', 'وثائق', 'مدة'
+    })
+    
+    # Multi-word keywords cannot match a single token, so they are checked as phrases
+    _ar_phrases = tuple(keyword for keyword in arabic_keywords if ' ' in keyword)
+    _fr_accent_re = re.compile(r'[àâäéèêëïîôöùûüÿç]')
+    
     def __init__(self, supported_languages: Optional[List[str]] = None, default_language: str = 'fr'):
         """
         Initialize the language detector.
@@ -24,24 +111,30 @@ class LanguageDetector:
             supported_languages: List of supported language codes.
             default_language: Default language to use if detection fails.
         """
-        self.supported_languages = supported_languages or ['fr', 'ar']
+        self.supported_languages = frozenset(supported_languages or ('fr', 'ar'))
         self.default_language = default_language
         
-        # Regular expressions for language detection backup
-        self.arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]+')
-        self.french_keywords = {
-            'quel', 'quelle', 'quels', 'quelles', 'comment', 'pourquoi', 'quand', 'où',
-            'combien', 'est', 'sont', 'être', 'avoir', 'faire', 'aller', 'venir',
-            'société', 'entreprise', 'création', 'capital', 'délai', 'document'
-        }
-        
-        self.arabic_keywords = {
-            'ما', 'ماذا', 'كيف', 'لماذا', 'متى', 'أين', 'كم', 'هل',
-            'شركة', 'مؤسسة', 'تأسيس', 'رأس المال', 'وثائق', 'مدة'
-        }
+        # Detection and validation are pure for a given detector configuration,
+        # so repeated inputs within a session are answered from a per-detector cache
+        self._detect_cached = lru_cache(maxsize=1024)(self._detect_uncached)
+        self._validate_cached = lru_cache(maxsize=64)(self._validate_uncached)
         
         logging.info(f"Initialized LanguageDetector with supported languages: {self.supported_languages}")
         
+    def _has_french_accents(self, text_lower: str) -> bool:
+        """
+        Check whether lowercased text contains French accented letters.
+        
+        Args:
+            text_lower: Lowercased input text.
+            
+        Returns:
+            True if any French accented letter is present.
+        """
+        if len(text_lower) > _LONG_TEXT_THRESHOLD:
+            return self._fr_accent_re.search(text_lower) is not None
+        return not _FR_ACCENTS.isdisjoint(text_lower)
+    
     def detect_language(self, text: str) -> str:
         """
         Detect the language of the input text.
@@ -52,15 +145,44 @@ class LanguageDetector:
         Returns:
             Detected language code or default language if detection fails.
         """
-        if not text or not isinstance(text, str) or len(text.strip()) < 2:
+        if not text or not isinstance(text, str):
             return self.default_language
         
         text = text.strip()
+        if len(text) < 2:
+            return self.default_language
         
-        # First try using langdetect if available
-        if LANGDETECT_AVAILABLE:
+        return self._detect_cached(text)
+    
+    def _detect_uncached(self, text: str) -> str:
+        """
+        Detect the language of already stripped, non-empty text.
+        
+        Args:
+            text: Stripped input text.
+            
+        Returns:
+            Detected language code or default language if detection fails.
+        """
+        # Lowercase once; reused by the accent check and pattern matching
+        text_lower = text.lower()
+        
+        # Cheapest checks first: any Arabic character is definitive
+        if self.arabic_pattern.search(text):
+            return 'ar' if 'ar' in self.supported_languages else self.default_language
+        
+        # French accented letters are a strong enough signal to skip langdetect
+        if self._has_french_accents(text_lower):
+            return 'fr' if 'fr' in self.supported_languages else self.default_language
+        
+        # Short queries go straight to the deterministic pattern detector
+        if len(text) < _MIN_STATISTICAL_LENGTH:
+            return self._detect_with_patterns(text, text_lower)
+        
+        # Only genuinely ambiguous Latin-script text goes through the statistical model
+        if STATISTICAL_DETECTION_AVAILABLE:
             try:
-                detected_lang = detect(text)
+                detected_lang = _statistical_detect(text)
                 
                 # Map similar language codes
                 if detected_lang in ['ar', 'arb']:
@@ -73,35 +195,37 @@ class LanguageDetector:
                     return detected_lang
                     
                 # If detected language is not supported, try regex patterns
-                return self._detect_with_patterns(text)
+                return self._detect_with_patterns(text, text_lower)
                 
             except Exception as e:
-                logging.debug(f"Langdetect failed: {e}. Falling back to pattern matching.")
+                logging.debug(f"Statistical detection failed: {e}. Falling back to pattern matching.")
                 # Fallback to regex pattern matching
-                return self._detect_with_patterns(text)
+                return self._detect_with_patterns(text, text_lower)
         else:
             # Use pattern-based detection
-            return self._detect_with_patterns(text)
+            return self._detect_with_patterns(text, text_lower)
     
-    def _detect_with_patterns(self, text: str) -> str:
+    def _detect_with_patterns(self, text: str, text_lower: str) -> str:
         """
         Detect language using regex patterns and keyword matching.
         
         Args:
             text: Input text.
+            text_lower: Lowercased input text.
             
         Returns:
             Detected language code or default language.
         """
-        text_lower = text.lower()
-        
         # Check for Arabic characters first (most reliable)
         if self.arabic_pattern.search(text):
             return 'ar' if 'ar' in self.supported_languages else self.default_language
         
-        # Count keyword matches for each language
-        french_matches = sum(1 for word in self.french_keywords if word in text_lower)
-        arabic_matches = sum(1 for word in self.arabic_keywords if word in text)
+        # Count keyword matches for each language via hash-based set intersection
+        tokens_lower = frozenset(_WORD_RE.findall(text_lower))
+        tokens_raw = frozenset(_WORD_RE.findall(text))
+        french_matches = len(tokens_lower & self.french_keywords)
+        arabic_matches = len(tokens_raw & self.arabic_keywords)
+        arabic_matches += sum(1 for phrase in self._ar_phrases if phrase in text)
         
         # Determine language based on keyword matches
         if arabic_matches > french_matches and arabic_matches > 0:
@@ -111,7 +235,7 @@ class LanguageDetector:
         
         # Check for specific patterns
         # French pattern: Latin characters with accents
-        if re.search(r'[àâäéèêëïîôöùûüÿç]', text_lower):
+        if self._has_french_accents(text_lower):
             return 'fr' if 'fr' in self.supported_languages else self.default_language
         
         # Default fallback
@@ -151,8 +275,7 @@ class LanguageDetector:
         Returns:
             'rtl' for right-to-left languages, 'ltr' otherwise.
         """
-        rtl_languages = ['ar', 'he', 'fa', 'ur']
-        return 'rtl' if language in rtl_languages else 'ltr'
+        return 'rtl' if language in _RTL_LANGUAGES else 'ltr'
     
     def get_language_name(self, language_code: str) -> str:
         """
@@ -164,15 +287,7 @@ class LanguageDetector:
         Returns:
             Full language name.
         """
-        language_names = {
-            'fr': 'Français',
-            'ar': 'العربية',
-            'en': 'English',
-            'es': 'Español',
-            'de': 'Deutsch'
-        }
-        
-        return language_names.get(language_code, language_code.upper())
+        return _language_name(language_code)
     
     def validate_language(self, language_code: str) -> str:
         """
@@ -187,25 +302,34 @@ class LanguageDetector:
         if not language_code or not isinstance(language_code, str):
             return self.default_language
             
+        return self._validate_cached(language_code)
+    
+    def _validate_uncached(self, language_code: str) -> str:
+        """
+        Normalize a non-empty language code string (see validate_language).
+        
+        Args:
+            language_code: Language code to validate.
+            
+        Returns:
+            Validated language code or default language if invalid.
+        """
         # Normalize to lowercase
         lang = language_code.lower().strip()
         
-        # Map common variations
-        language_mappings = {
-            'french': 'fr',
-            'francais': 'fr',
-            'français': 'fr',
-            'arabic': 'ar',
-            'arabe': 'ar',
-            'العربية': 'ar'
-        }
-        
-        # Check mappings first
-        if lang in language_mappings:
-            lang = language_mappings[lang]
-        
-        # Check if the language is supported
-        if lang in self.supported_languages:
-            return lang
-        
-        return self.default_language
\ No newline at end of file
+        # Map common variations, then check if the language is supported
+        lang = _LANGUAGE_MAPPINGS.get(lang, lang)
+        return lang if lang in self.supported_languages else self.default_language
+
+@lru_cache(maxsize=1)
+def get_detector() -> LanguageDetector:
+    """
+    Get the process-wide shared LanguageDetector.
+    
+    Returns:
+        LanguageDetector with the default configuration.
+    """
+    return LanguageDetector()
+
+# Shared detector; reuse it instead of instantiating LanguageDetector per request
+default_detector = get_detector()
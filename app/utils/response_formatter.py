@@ -3,9 +3,66 @@ Utilities for formatting chatbot responses.
 """
 
 import re
+import string
 import logging
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
 
+# RNE codes (e.g., RNE M 004.37, RNE-M-004.37, etc.), matched in a single pass
+_RNE_RE = re.compile(
+    r'RNE\s+[A-Z]\s+\d+\.\d+'   # RNE M 004.37
+    r'|RNE-[A-Z]-\d+\.\d+'      # RNE-M-004.37
+    r'|RNE[A-Z]\d+\.\d+'        # RNEM004.37
+    r'|[A-Z]\s+\d+\.\d+',       # M 004.37 (when RNE is implied)
+    re.IGNORECASE
+)
+
+# Bare code form; with an "RNE" substring check it gates the full scan above
+_BARE_CODE_RE = re.compile(r'[A-Z]\s+\d+\.\d+', re.IGNORECASE)
+
+# Right-to-left languages
+_RTL_LANGUAGES = frozenset(('ar', 'he', 'fa', 'ur'))
+
+# Code normalization table: keeps A-Z, 0-9 and '.', maps any other character to a space
+_CODE_XLAT = defaultdict(
+    lambda: ' ',
+    {ord(c): ord(c) for c in string.ascii_uppercase + string.digits + '.'}
+)
+
+_WS_RE = re.compile(r'\s+')
+
+# Question/answer block templates for multi-question responses
+_MULTI_TEMPLATE_FR = "**Question {i}:** {q}\n\n**Réponse {i}:** {a}"
+_MULTI_TEMPLATE_AR = "**السؤال {i}:** {q}\n\n**الإجابة {i}:** {a}"
+
+# Shared fallback for results without a document (never mutated)
+_EMPTY_DOC: Dict[str, Any] = {}
+
+# Whitespace around sentence punctuation (see clean_response)
+_PUNCT_SPACING_RE = re.compile(r'\s*([.!?])\s*')
+
+def _normalize_rne_code(code: str) -> str:
+    """Normalize a matched RNE code to the "RNE X XXX.XX" format."""
+    normalized = ' '.join(code.upper().translate(_CODE_XLAT).split())
+    
+    if not normalized.startswith('RNE'):
+        normalized = f"RNE {normalized}"
+    return normalized
+
+# Default error messages by language
+_DEFAULT_ERROR_MESSAGES = {
+    'fr': "Désolé, une erreur s'est produite. Veuillez réessayer.",
+    'ar': "آسف، حدث خطأ. يرجى المحاولة مرة أخرى."
+}
+
+@lru_cache(maxsize=8)
+def _default_error(language: str) -> tuple:
+    """Return the cached (default message, text direction) pair for a language."""
+    message = _DEFAULT_ERROR_MESSAGES.get(language, _DEFAULT_ERROR_MESSAGES['fr'])
+    return message, ResponseFormatter._get_text_direction(language)
+
 class ResponseFormatter:
     """
     Class for formatting chatbot responses based on language and query type.
@@ -31,39 +88,47 @@ class ResponseFormatter:
             Dictionary with formatted response data.
         """
         try:
+            # Strip once; the stripped text is reused below
+            response = response.strip() if response else ''
+            question = question.strip() if question else ''
+            
             # Extract any referenced codes from the response
             referenced_codes = ResponseFormatter._extract_rne_codes(response)
+            referenced_codes_set = set(referenced_codes)
             
-            # Format document references
-            references = []
-            seen_codes = set()
+            # Format document references, keeping the first reference per code
+            refs_by_code = {}
             
             for doc in documents:
-                document = doc.get('document', {})
-                code = document.get('code', '')
+                document = doc.get('document') or _EMPTY_DOC
+                code = document.get('code')
+                if not code or code in refs_by_code:
+                    continue
                 
                 # Only include if code is referenced in response or if no codes were referenced
-                if not referenced_codes or code in referenced_codes:
-                    if code and code not in seen_codes:
-                        references.append({
-                            'code': code,
-                            'procedure': document.get('procedure', ''),
-                            'type_entreprise': document.get('type_entreprise', ''),
-                            'score': doc.get('score', 0.0),
-                            'pdf_link': document.get('pdf_link', ''),
-                            'language': document.get('language', language)
-                        })
-                        seen_codes.add(code)
+                if referenced_codes_set and code not in referenced_codes_set:
+                    continue
+                
+                refs_by_code[code] = {
+                    'code': code,
+                    'procedure': document.get('procedure', ''),
+                    'type_entreprise': document.get('type_entreprise', ''),
+                    'score': doc.get('score', 0.0),
+                    'pdf_link': document.get('pdf_link', ''),
+                    'language': document.get('language', language)
+                }
+            
+            references = list(refs_by_code.values())
             
             # Determine text direction based on language
             text_direction = ResponseFormatter._get_text_direction(language)
             
             return {
-                'response': response.strip() if response else '',
+                'response': response,
                 'language': language,
                 'text_direction': text_direction,
                 'references': references,
-                'query': question.strip() if question else '',
+                'query': question,
                 'document_count': len(documents),
                 'referenced_codes': referenced_codes
             }
@@ -103,43 +168,36 @@ class ResponseFormatter:
                 return ResponseFormatter.format_response('', original_query, [], language)
             
             # Combine all responses
-            combined_response = ""
-            all_references = []
-            all_codes = set()
+            parts = []
+            ref_by_code = {}
+            all_referenced_codes = set()
             total_docs = 0
             
-            for i, resp in enumerate(responses):
-                question = resp.get('query', '')
-                answer = resp.get('response', '')
-                
+            # Resolve the language-dependent template once
+            template = _MULTI_TEMPLATE_AR if language == 'ar' else _MULTI_TEMPLATE_FR
+            
+            for i, resp in enumerate(responses, 1):
                 # Add question and answer with proper formatting
-                if language == 'ar':
-                    combined_response += f"**السؤال {i+1}:** {question}\n\n"
-                    combined_response += f"**الإجابة {i+1}:** {answer}\n\n"
-                    if i < len(responses) - 1:  # Don't add separator after last response
-                        combined_response += "---\n\n"
-                else:
-                    combined_response += f"**Question {i+1}:** {question}\n\n"
-                    combined_response += f"**Réponse {i+1}:** {answer}\n\n"
-                    if i < len(responses) - 1:
-                        combined_response += "---\n\n"
-                    
-                # Collect references
-                resp_refs = resp.get('references', [])
-                for ref in resp_refs:
+                parts.append(template.format(i=i, q=resp.get('query', ''), a=resp.get('response', '')))
+                
+                # Collect references, keeping the first one seen per code
+                for ref in resp.get('references', []):
                     code = ref.get('code', '')
-                    if code and code not in all_codes:
-                        all_references.append(ref)
-                        all_codes.add(code)
+                    if code:
+                        ref_by_code.setdefault(code, ref)
                 
-                # Collect referenced codes
-                resp_codes = resp.get('referenced_codes', [])
-                all_codes.update(resp_codes)
+                # Collect referenced codes (kept apart from the reference dedup)
+                all_referenced_codes.update(resp.get('referenced_codes', []))
                 
                 total_docs += resp.get('document_count', 0)
             
+            # Separate the question/answer blocks with a horizontal rule
+            combined_response = "\n\n---\n\n".join(parts)
+            
             # Sort references by score (highest first)
-            all_references.sort(key=lambda x: x.get('score', 0), reverse=True)
+            # (references built by format_response always carry a score)
+            all_references = list(ref_by_code.values())
+            all_references.sort(key=itemgetter('score'), reverse=True)
             
             # Determine text direction based on language
             text_direction = ResponseFormatter._get_text_direction(language)
@@ -152,7 +210,7 @@ class ResponseFormatter:
                 'query': original_query.strip() if original_query else '',
                 'question_count': len(responses),
                 'document_count': total_docs,
-                'referenced_codes': list(all_codes)
+                'referenced_codes': list(all_referenced_codes)
             }
             
         except Exception as e:
@@ -220,16 +278,10 @@ class ResponseFormatter:
             Dictionary with formatted error response.
         """
         try:
-            text_direction = ResponseFormatter._get_text_direction(language)
-            
-            # Default error messages by language
-            default_messages = {
-                'fr': "Désolé, une erreur s'est produite. Veuillez réessayer.",
-                'ar': "آسف، حدث خطأ. يرجى المحاولة مرة أخرى."
-            }
+            default_message, text_direction = _default_error(language)
             
             if not error_message or not error_message.strip():
-                error_message = default_messages.get(language, default_messages['fr'])
+                error_message = default_message
             
             return {
                 'type': 'error',
@@ -264,36 +316,13 @@ class ResponseFormatter:
             return []
         
         try:
-            # Pattern to match RNE codes (e.g., RNE M 004.37, RNE-M-004.37, etc.)
-            patterns = [
-                r'RNE\s+[A-Z]\s+\d+\.\d+',  # RNE M 004.37
-                r'RNE-[A-Z]-\d+\.\d+',      # RNE-M-004.37
-                r'RNE[A-Z]\d+\.\d+',        # RNEM004.37
-                r'[A-Z]\s+\d+\.\d+',        # M 004.37 (when RNE is implied)
-            ]
-            
-            codes = []
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                codes.extend(matches)
+            # Most responses cite no code at all: skip the alternation scan
+            if 'RNE' not in text.upper() and not _BARE_CODE_RE.search(text):
+                return []
             
-            # Normalize codes and remove duplicates
-            normalized_codes = []
-            seen = set()
-            
-            for code in codes:
-                # Normalize the format to "RNE X XXX.XX"
-                normalized = re.sub(r'[^A-Z0-9\.]', ' ', code.upper())
-                normalized = re.sub(r'\s+', ' ', normalized).strip()
-                
-                if not normalized.startswith('RNE'):
-                    normalized = f"RNE {normalized}"
-                
-                if normalized not in seen:
-                    normalized_codes.append(normalized)
-                    seen.add(normalized)
-            
-            return normalized_codes
+            # Drop duplicate raw matches first, then normalize and dedupe (order-preserving)
+            codes = dict.fromkeys(_RNE_RE.findall(text))
+            return list(dict.fromkeys(_normalize_rne_code(code) for code in codes))
             
         except Exception as e:
             logging.error(f"Error extracting RNE codes: {e}")
@@ -310,8 +339,7 @@ class ResponseFormatter:
         Returns:
             'rtl' for right-to-left languages, 'ltr' otherwise.
         """
-        rtl_languages = ['ar', 'he', 'fa', 'ur']
-        return 'rtl' if language in rtl_languages else 'ltr'
+        return 'rtl' if language in _RTL_LANGUAGES else 'ltr'
     
     @staticmethod
     def truncate_response(text: str, max_length: int = 1000) -> str:
@@ -330,12 +358,10 @@ class ResponseFormatter:
         
         # Try to cut at a sentence boundary
         truncated = text[:max_length]
-        last_period = truncated.rfind('.')
-        last_question = truncated.rfind('?')
-        last_exclamation = truncated.rfind('!')
         
-        # Find the last sentence ending
-        last_sentence_end = max(last_period, last_question, last_exclamation)
+        # Find the last sentence ending (rfind is a C-level reverse scan;
+        # three of them beat one regex over a reversed copy)
+        last_sentence_end = max(truncated.rfind(c) for c in '.!?')
         
         if last_sentence_end > max_length * 0.8:  # If we can preserve at least 80% of content
             return text[:last_sentence_end + 1]
@@ -356,13 +382,10 @@ class ResponseFormatter:
         if not text:
             return ''
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Remove multiple consecutive line breaks
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+        # Remove extra whitespace (this also collapses line breaks)
+        text = _WS_RE.sub(' ', text).strip()
         
         # Ensure proper spacing around punctuation
-        text = re.sub(r'\s*([.!?])\s*', r'\1 ', text)
+        text = _PUNCT_SPACING_RE.sub(r'\1 ', text)
         
         return text.strip()
\ No newline at end of file
@@ -6,16 +6,16 @@ This should be run once before starting the application.
 import os
 import sys
 import traceback
-import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import ijson
 
 # Add the app directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.utils.config import DATA_PATH, FAISS_INDEX_PATH, BM25_DATA_PATH
 from app.services.data_loader import RNEDataLoader
-from app.services.faiss_retriever import FAISSRetriever
-from app.services.bm25_retriever import BM25Retriever
 
 # Configure logging
 logging.basicConfig(
@@ -31,41 +31,76 @@ def verify_json_file(file_path):
         return False
         
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        expected_keys = ['code', 'type_entreprise', 'procedure']
+        
+        # Stream the file so verification never materializes the whole corpus
+        with open(file_path, 'rb') as f:
+            # Peek at the first non-whitespace byte to find the top-level type
+            first_byte = f.read(1)
+            while first_byte.isspace():
+                first_byte = f.read(1)
+            f.seek(0)
             
-        if isinstance(data, list):
-            logger.info(f"JSON file is valid and contains {len(data)} items")
-            # Check the first item for expected structure
-            if data:
-                first_item = data[0]
-                expected_keys = ['code', 'type_entreprise', 'procedure']
-                missing_keys = [key for key in expected_keys if key not in first_item]
+            if first_byte == b'[':
+                items = ijson.items(f, 'item')
+                first_item = next(items, None)
+                count = 0 if first_item is None else 1 + sum(1 for _ in items)
+                
+                logger.info(f"JSON file is valid and contains {count} items")
+                # Check the first item for expected structure
+                if isinstance(first_item, dict):
+                    missing_keys = [key for key in expected_keys if key not in first_item]
+                    if missing_keys:
+                        logger.warning(f"First item is missing expected keys: {missing_keys}")
+                    else:
+                        logger.info("First item has expected structure")
+                        
+            elif first_byte == b'{':
+                data = next(ijson.items(f, ''))
+                logger.info("JSON file is valid and contains a single item")
+                missing_keys = [key for key in expected_keys if key not in data]
                 if missing_keys:
-                    logger.warning(f"First item is missing expected keys: {missing_keys}")
+                    logger.warning(f"Item is missing expected keys: {missing_keys}")
                 else:
-                    logger.info("First item has expected structure")
-                    
-        elif isinstance(data, dict):
-            logger.info("JSON file is valid and contains a single item")
-            expected_keys = ['code', 'type_entreprise', 'procedure']
-            missing_keys = [key for key in expected_keys if key not in data]
-            if missing_keys:
-                logger.warning(f"Item is missing expected keys: {missing_keys}")
+                    logger.info("Item has expected structure")
             else:
-                logger.info("Item has expected structure")
-        else:
-            logger.warning(f"JSON file has unexpected format. Expected a list or dictionary.")
-            
+                # Still make sure the file parses at all
+                for _ in ijson.items(f, ''):
+                    pass
+                logger.warning(f"JSON file has unexpected format. Expected a list or dictionary.")
+                
         return True
         
-    except json.JSONDecodeError as e:
+    except ijson.JSONError as e:
         logger.error(f"Invalid JSON file at {file_path}. Details: {str(e)}")
         return False
     except Exception as e:
         logger.error(f"Error checking JSON file: {str(e)}")
         return False
 
+def _file_stamp(path):
+    """Return (mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _build_bm25(data_path, texts, docs):
+    """
+    Build and save the BM25 index (runs in a worker process).
+    
+    Returns:
+        True if the BM25 data file was written.
+    """
+    from app.services.bm25_retriever import BM25Retriever
+    
+    # The retriever only logs save errors, so confirm the output file changed
+    before = _file_stamp(data_path)
+    BM25Retriever(data_path).build_index(texts, docs)
+    after = _file_stamp(data_path)
+    return after is not None and after != before
+
 def initialize_indices():
     """Initialize FAISS and BM25 indices."""
     logger.info("Initializing indices for the RNE chatbot...")
@@ -105,19 +140,34 @@ def initialize_indices():
             logger.error("No text extracted for indexing")
             return False
         
-        # Initialize retrievers
-        faiss_retriever = FAISSRetriever(FAISS_INDEX_PATH)
-        bm25_retriever = BM25Retriever(BM25_DATA_PATH)
-        
-        # Build indices
-        logger.info("Building FAISS index...")
-        faiss_retriever.build_index(texts, docs)
+        # Build BM25 in a worker process while the FAISS index is built here.
+        # The worker is started before the retriever imports, so torch is not
+        # loaded in the parent when it forks.
+        logger.info("Building FAISS and BM25 indices...")
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            bm25_future = executor.submit(_build_bm25, BM25_DATA_PATH, texts, docs)
+            
+            from app.services.faiss_retriever import FAISSRetriever
+            from app.services.bm25_retriever import BM25Retriever
+            
+            faiss_retriever = FAISSRetriever(FAISS_INDEX_PATH)
+            faiss_retriever.build_index(texts, docs)
+            
+            # Re-raise any error from the worker
+            bm25_saved = bm25_future.result()
         
-        logger.info("Building BM25 index...")
-        bm25_retriever.build_index(texts, docs)
+        if not bm25_saved:
+            logger.error(f"BM25 data was not saved to {BM25_DATA_PATH}")
+            return False
         
         logger.info("Indices built and saved successfully!")
         
+        # Load the BM25 index the worker saved for the retrieval tests
+        bm25_retriever = BM25Retriever(BM25_DATA_PATH)
+        if not bm25_retriever.load_index():
+            logger.error("Failed to load the saved BM25 index")
+            return False
+        
         # Test retrieval
         test_queries = [
             "documents pour immatriculation sarl",
@@ -125,17 +175,25 @@ def initialize_indices():
             "délai création entreprise"
         ]
         
-        for test_query in test_queries:
+        # Embed and search all test queries with FAISS in one batch
+        try:
+            faiss_batch = faiss_retriever.search_batch(test_queries, top_k=2)
+        except Exception as e:
+            logger.error(f"Error testing FAISS: {e}")
+            faiss_batch = None
+        
+        for q, test_query in enumerate(test_queries):
             logger.info(f"\nTesting retrieval with query: {test_query}")
             
             # Test FAISS
-            try:
-                faiss_results = faiss_retriever.search(test_query, top_k=2)
-                logger.info(f"FAISS found {len(faiss_results)} results:")
-                for i, result in enumerate(faiss_results):
-                    logger.info(f"  Result {i+1}: {result['document']['code']} (Score: {result['score']:.4f})")
-            except Exception as e:
-                logger.error(f"Error testing FAISS: {e}")
+            if faiss_batch is not None:
+                try:
+                    faiss_results = faiss_batch[q]
+                    logger.info(f"FAISS found {len(faiss_results)} results:")
+                    for i, result in enumerate(faiss_results):
+                        logger.info(f"  Result {i+1}: {result['document']['code']} (Score: {result['score']:.4f})")
+                except Exception as e:
+                    logger.error(f"Error testing FAISS: {e}")
                 
             # Test BM25
             try:
@@ -6,8 +6,10 @@ Run this step by step to isolate the issue.
 import sys
 import traceback
 import os
-import json
-import logging
+from pathlib import Path
+
+# Make the project root importable when run as `python scripts/debug_helper.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def test_imports():
     """Test 1: Check if all imports work."""
@@ -217,6 +219,12 @@ def test_flask_app():
 
 def test_request_format():
     """Test 6: Check expected request format."""
+    import json
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    
     print("\n=== Testing Request Format ===")
     
     # Show expected request format
@@ -246,8 +254,13 @@ def test_request_format():
     # Test JSON parsing
     try:
         for format_name, format_data in expected_formats.items():
-            json_str = json.dumps(format_data, ensure_ascii=False)
-            parsed = json.loads(json_str)
+            if orjson:
+                # orjson emits UTF-8 bytes, so non-ASCII text is preserved as-is
+                json_str = orjson.dumps(format_data).decode()
+                parsed = orjson.loads(json_str)
+            else:
+                json_str = json.dumps(format_data, ensure_ascii=False)
+                parsed = json.loads(json_str)
             print(f"✓ {format_name} JSON parsing works")
         return True
     except Exception as e:
@@ -309,101 +322,9 @@ def create_minimal_working_example():
     """Create a minimal working example."""
     print("\n=== Creating Minimal Working Example ===")
     
-    minimal_app = '''
-from flask import Flask, request, jsonify
-import traceback
-import logging
-import sys
-import os
-
-# Add the project root to the Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-# Enable logging
-logging.basicConfig(level=logging.DEBUG)
-
-app = Flask(__name__)
-
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    try:
-        logging.info("Received request to /api/chat")
-        
-        # Get request data
-        data = request.get_json()
-        logging.info(f"Request data: {data}")
-        
-        if not data:
-            return jsonify({"error": "No JSON data"}), 400
-        
-        query = data.get('query', '')
-        if not query:
-            return jsonify({"error": "No query provided"}), 400
-        
-        language = data.get('language', 'fr')
-        
-        # Try to use the actual OpenAI client
-        try:
-            from app.services.openai_client import OpenAIClient
-            from app.services.openai_client import DirectResponse, FollowUpResponse
-            
-            client = OpenAIClient()
-            response_obj = client.generate_response(
-                query=query,
-                context=[],
-                language=language
-            )
-            
-            if isinstance(response_obj, FollowUpResponse):
-                response = {
-                    "type": "clarification_needed",
-                    "response": response_obj.main_response,
-                    "follow_up_question": response_obj.follow_up_question,
-                    "options": response_obj.options,
-                    "context": {"awaiting_clarification": True}
-                }
-            elif isinstance(response_obj, DirectResponse):
-                response = {
-                    "type": "direct_answer",
-                    "response": response_obj.response,
-                    "context": {"awaiting_clarification": False}
-                }
-            else:
-                response = {
-                    "type": "direct_answer",
-                    "response": str(response_obj),
-                    "context": {"awaiting_clarification": False}
-                }
-                
-        except Exception as openai_error:
-            logging.error(f"OpenAI client error: {openai_error}")
-            # Fallback to simple response
-            response = {
-                "type": "direct_answer",
-                "response": f"Simple test response for: {query}",
-                "context": {"awaiting_clarification": False}
-            }
-        
-        logging.info(f"Sending response: {response}")
-        return jsonify({"success": True, "response": response})
-        
-    except Exception as e:
-        logging.error(f"Error in chat endpoint: {str(e)}")
-        logging.error(traceback.format_exc())
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/health', methods=['GET'])
-def health():
-    """Health check endpoint."""
-    return jsonify({"status": "healthy", "message": "API is running"})
-
-if __name__ == '__main__':
-    print("Starting minimal test app...")
-    app.run(debug=True, host='127.0.0.1', port=5000)
-'''
-    
-    with open('minimal_test_app.py', 'w', encoding='utf-8') as f:
-        f.write(minimal_app)
+    # The app source lives in a sibling template and is only read when needed
+    template_path = Path(__file__).parent / 'minimal_test_app.py.tmpl'
+    Path('minimal_test_app.py').write_bytes(template_path.read_bytes())
     
     print("✓ Created minimal_test_app.py")
     print("\nTo test:")